@@ -34,18 +34,78 @@
 """
 
 import argparse
+import functools
+import io
 import json
 import os
+import re
 import sys
 
 # 检查是否安装了依赖
 try:
+    import httpx
     from openai import OpenAI
 except ImportError:
     print("错误: 需要安装openai包", file=sys.stderr)
     print("请运行: pip install openai", file=sys.stderr)
     sys.exit(1)
 
+# orjson解析/序列化比stdlib json快数倍，未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 匹配markdown代码块围栏（```json ... ``` 或 ``` ... ```），单次扫描提取内容
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?(.*?)```", re.DOTALL)
+
+
+def _extract_fenced(result):
+    """提取围栏代码块中的内容，没有围栏时原样返回"""
+    m = _FENCE_RE.search(result)
+    return m.group(1).strip() if m else result
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(base_url, api_key):
+    """
+    按(base_url, api_key)缓存OpenAI客户端
+
+    同一进程内循环调用时复用底层TLS连接，省去每次调用的握手；
+    服务端支持HTTP/2时还能在同一连接上多路复用。
+    """
+    try:
+        # http2=True需要h2包，未安装时回退到默认HTTP/1.1客户端
+        http_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60)
+        )
+    except ImportError:
+        http_client = None
+
+    kwargs = {"api_key": api_key, "base_url": base_url}
+    if http_client is not None:
+        kwargs["http_client"] = http_client
+    return OpenAI(**kwargs)
+
+
+def _loads(text):
+    """解析JSON字符串（优先orjson）"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _dump_json(obj, output_path):
+    """带缩进写出JSON文件（优先orjson）"""
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+
 
 def call_llm(base_url, model, prompt, output_path, 
              output_format="json", temperature=0.7, max_tokens=2000,
@@ -73,13 +133,10 @@ def call_llm(base_url, model, prompt, output_path,
     if not api_key:
         raise ValueError("未找到API密钥，请设置环境变量 ARK_API_KEY 或 OPENAI_API_KEY")
     
-    # 创建客户端
-    client = OpenAI(
-        api_key=api_key,
-        base_url=base_url
-    )
+    # 获取缓存的客户端（同一base_url+api_key复用连接）
+    client = _get_client(base_url, api_key)
     
-    # 调用API
+    # 调用API（流式返回，边生成边处理，不等整段补全）
     try:
         response = client.chat.completions.create(
             model=model,
@@ -88,33 +145,40 @@ def call_llm(base_url, model, prompt, output_path,
                 {"role": "user", "content": prompt}
             ],
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            stream=True
         )
-        
-        result = response.choices[0].message.content
-        
-        # 根据格式保存结果
+
         if output_format == "json":
+            # JSON需要完整内容才能解析：先流式累积，再一次性提取解析
+            buf = io.StringIO()
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    buf.write(chunk.choices[0].delta.content)
+            result = buf.getvalue()
+
             # 尝试解析为JSON
             try:
                 # 如果结果是markdown代码块中的JSON，提取出来
-                if "```json" in result:
-                    result = result.split("```json")[1].split("```")[0].strip()
-                elif "```" in result:
-                    result = result.split("```")[1].split("```")[0].strip()
-                
-                json_result = json.loads(result)
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_result, f, ensure_ascii=False, indent=2)
-            except json.JSONDecodeError:
+                payload = _extract_fenced(result)
+
+                json_result = _loads(payload)
+                _dump_json(json_result, output_path)
+            except ValueError:
                 # 如果不是JSON，作为普通文本保存
                 with open(output_path, 'w', encoding='utf-8') as f:
                     f.write(result)
         else:
-            # markdown格式，直接保存
+            # markdown格式，token一到就直写到磁盘
+            pieces = []
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result)
-        
+                for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        delta = chunk.choices[0].delta.content
+                        f.write(delta)
+                        pieces.append(delta)
+            result = ''.join(pieces)
+
         print(f"成功: 已保存到 {output_path}", file=sys.stderr)
         return result
         
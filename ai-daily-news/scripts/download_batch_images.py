@@ -14,81 +14,262 @@ import argparse
 import json
 import os
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import urlparse
 
 # 添加scripts目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from download_image import download_image
+from download_image import download_image, _SESSION
 
+# orjson解析大JSON比stdlib json快数倍，未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def download_images_from_data(data_file, output_dir, date_str=None):
+# ijson支持流式解析，边读JSON边开始下载，未安装时回退为整体加载
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# 单个主机的最大并发请求数（避免对arxiv等热点主机触发429限流）
+PER_HOST_CONCURRENCY = 4
+# 触发429后的全局退避时间（秒）
+BACKOFF_SECONDS = 10
+
+# 按主机限流的信号量表
+_host_semaphores = defaultdict(lambda: threading.Semaphore(PER_HOST_CONCURRENCY))
+# 全局退避开关：任一主机返回429时，所有线程暂停一段时间
+_backoff_event = threading.Event()
+
+
+def _download_with_limit(img_url, output_path, timeout=30):
     """
-    从数据文件中批量下载图片
-    
+    带限流的图片下载：按主机限制并发，429时全局退避
+
+    Session自带的Retry会在429时按Retry-After头重试；这里额外
+    暂停新请求的发起，避免重试风暴加剧限流。
+    """
+    # 已下载过的图片直接跳过（部分失败后重跑时不重复下载）
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        print(f"  已存在，跳过: {output_path}", file=sys.stderr)
+        return output_path
+
+    # 全局退避中，等待解除
+    while _backoff_event.is_set():
+        time.sleep(0.5)
+
+    host = urlparse(img_url).netloc
+    with _host_semaphores[host]:
+        try:
+            return download_image(img_url, output_path, timeout=timeout, session=_SESSION)
+        except Exception as e:
+            # 429说明主机已过载，全局暂停一段时间再放行新请求
+            if "429" in str(e) and not _backoff_event.is_set():
+                print(f"  主机 {host} 返回429，全局退避 {BACKOFF_SECONDS}s", file=sys.stderr)
+                _backoff_event.set()
+                threading.Timer(BACKOFF_SECONDS, _backoff_event.clear).start()
+            raise
+
+
+def prewarm_connections(urls, max_workers=8):
+    """
+    预热各主机的连接
+
+    对每个主机先发一个HEAD请求，把TCP+TLS握手提前完成并放入
+    连接池，正式下载时直接复用socket。纯尽力而为，失败忽略。
+
+    Args:
+        urls: 图片URL列表
+        max_workers: 预热线程数
+    """
+    hosts = {urlparse(url).netloc for url in urls if urlparse(url).scheme in ('http', 'https')}
+    if not hosts:
+        return
+
+    print(f"预热 {len(hosts)} 个主机的连接...", file=sys.stderr)
+
+    def warm(host):
+        try:
+            _SESSION.head(f"https://{host}/", timeout=5)
+        except Exception:
+            pass  # 预热失败不影响下载
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(hosts))) as executor:
+        executor.map(warm, hosts)
+
+
+def entry_download_tasks(idx, entry, output_dir, seen_urls=None):
+    """
+    收集单个条目的下载任务
+
+    Args:
+        idx: 条目序号（从1开始）
+        entry: 条目字典
+        output_dir: 输出目录
+        seen_urls: 已见过的URL集合（跨条目去重，None时不去重）
+
+    Returns:
+        list: (idx, img_idx, img_url, output_path) 元组列表
+    """
+    title = entry.get("title", "")[:50]
+    source = entry.get("source", "")
+
+    print(f"[{idx}] {source}: {title}", file=sys.stderr)
+
+    # 收集所有图片URL
+    image_urls = []
+
+    # 单张图片（Hacker News等）
+    image = entry.get("image")
+    if image:
+        image_urls.append(image)
+
+    # 多张图片（ArXiv论文）
+    images = entry.get("images", [])
+    if images:
+        image_urls.extend(images)
+
+    if not image_urls:
+        print(f"  无图片", file=sys.stderr)
+        return []
+
+    tasks = []
+    for img_idx, img_url in enumerate(image_urls, 1):
+        # 同一URL在多个条目中出现时只下载一次
+        if seen_urls is not None:
+            if img_url in seen_urls:
+                print(f"  重复URL，跳过: {img_url}", file=sys.stderr)
+                continue
+            seen_urls.add(img_url)
+
+        # 生成文件名（只看URL的path部分，避免查询串混进扩展名，
+        # 如 .png?x=1）
+        ext = Path(urlparse(img_url).path).suffix.lower()
+        if not ext:
+            ext = ".png"
+
+        filename = f"{idx:02d}_{img_idx}{ext}"
+        output_path = str(Path(output_dir) / filename)
+        tasks.append((idx, img_idx, img_url, output_path))
+
+    return tasks
+
+
+def collect_download_tasks(entries, output_dir):
+    """
+    从条目列表中收集下载任务
+
+    Args:
+        entries: 条目列表
+        output_dir: 输出目录
+
+    Returns:
+        list: (idx, img_idx, img_url, output_path) 元组列表
+    """
+    tasks = []
+    seen_urls = set()
+    for idx, entry in enumerate(entries, 1):
+        tasks.extend(entry_download_tasks(idx, entry, output_dir, seen_urls))
+    return tasks
+
+
+def iter_entries_streaming(data_file):
+    """
+    用ijson逐条流式产出条目，峰值内存只有单条记录大小
+
+    Args:
+        data_file: JSON数据文件路径
+
+    Yields:
+        dict: 单条entry
+    """
+    with open(data_file, 'rb') as f:
+        # 根是对象时取entries数组，根是数组时直接取元素
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        prefix = 'entries.item' if first == b'{' else 'item'
+        yield from ijson.items(f, prefix)
+
+
+def download_images_from_data(data_file, output_dir, date_str=None, concurrency=16):
+    """
+    从数据文件中批量下载图片（多线程并发）
+
     Args:
         data_file: JSON数据文件路径
         output_dir: 输出目录
         date_str: 日期字符串（用于文件命名）
+        concurrency: 并发下载线程数
     """
     # 创建输出目录
     Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # 读取数据
-    with open(data_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # 提取entries列表
-    entries = data.get("entries", data) if isinstance(data, dict) else data
-    
-    print(f"找到 {len(entries)} 条数据", file=sys.stderr)
-    
+
     success_count = 0
     fail_count = 0
-    
-    # 遍历每个条目
-    for idx, entry in enumerate(entries, 1):
-        title = entry.get("title", "")[:50]
-        source = entry.get("source", "")
-        
-        print(f"\n[{idx}] {source}: {title}", file=sys.stderr)
-        
-        # 收集所有图片URL
-        image_urls = []
-        
-        # 单张图片（Hacker News等）
-        image = entry.get("image")
-        if image:
-            image_urls.append(image)
-        
-        # 多张图片（ArXiv论文）
-        images = entry.get("images", [])
-        if images:
-            image_urls.extend(images)
-        
-        if not image_urls:
-            print(f"  无图片", file=sys.stderr)
-            continue
-        
-        # 下载该条目的所有图片
-        for img_idx, img_url in enumerate(image_urls, 1):
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+
+        if ijson is not None:
+            # 流式解析：每解析出一条entry立刻提交下载，
+            # 首个下载无需等待整份JSON读完
+            print(f"流式解析 {data_file}（并发数 {concurrency}）", file=sys.stderr)
+            seen_urls = set()
+            for idx, entry in enumerate(iter_entries_streaming(data_file), 1):
+                for _, img_idx, img_url, output_path in entry_download_tasks(idx, entry, output_dir, seen_urls):
+                    future = executor.submit(_download_with_limit, img_url, output_path)
+                    futures[future] = (idx, img_idx, img_url)
+        else:
+            # 回退：整体加载后统一提交
+            if orjson is not None:
+                with open(data_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(data_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+            # 提取entries列表
+            entries = data.get("entries", data) if isinstance(data, dict) else data
+
+            print(f"找到 {len(entries)} 条数据", file=sys.stderr)
+
+            tasks = collect_download_tasks(entries, output_dir)
+
+            print(f"\n共 {len(tasks)} 张图片待下载（并发数 {concurrency}）", file=sys.stderr)
+
+            # 预热连接池，首个请求免去握手RTT
+            # （流式路径下载随解析立即开始，无需预热）
+            prewarm_connections([img_url for _, _, img_url, _ in tasks])
+
+            # 同主机的任务相邻提交，更容易命中刚释放的keep-alive连接
+            tasks.sort(key=lambda t: urlparse(t[2]).netloc)
+
+            for idx, img_idx, img_url, output_path in tasks:
+                future = executor.submit(_download_with_limit, img_url, output_path)
+                futures[future] = (idx, img_idx, img_url)
+
+        total = len(futures)
+        for future in as_completed(futures):
+            idx, img_idx, img_url = futures[future]
             try:
-                # 生成文件名
-                ext = os.path.splitext(img_url)[1]
-                if not ext:
-                    ext = ".png"
-                
-                filename = f"{idx:02d}_{img_idx}{ext}"
-                output_path = os.path.join(output_dir, filename)
-                
-                print(f"  下载图片 {img_idx}: {img_url}", file=sys.stderr)
-                download_image(img_url, output_path, timeout=30)
+                future.result()
                 success_count += 1
-                
             except Exception as e:
-                print(f"  下载失败 {img_idx}: {e}", file=sys.stderr)
+                print(f"  下载失败 [{idx}-{img_idx}]: {e}", file=sys.stderr)
                 fail_count += 1
-    
+
+            done = success_count + fail_count
+            print(f"  进度: {done}/{total}", file=sys.stderr)
+
     print(f"\n下载完成: 成功 {success_count}, 失败 {fail_count}", file=sys.stderr)
     return success_count, fail_count
 
@@ -98,13 +279,16 @@ def main():
     parser.add_argument("--input", required=True, help="输入JSON文件路径")
     parser.add_argument("--output", required=True, help="输出目录")
     parser.add_argument("--date", type=str, help="日期（用于文件命名）")
-    
+    parser.add_argument("--concurrency", type=int, default=16,
+                        help="并发下载线程数（默认16）")
+
     args = parser.parse_args()
-    
+
     success, fail = download_images_from_data(
         args.input,
         args.output,
-        args.date
+        args.date,
+        concurrency=args.concurrency
     )
     
     if fail > 0:
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+批量下载图片（asyncio + aiohttp版本）
+
+与download_batch_images.py功能相同，但使用单事件循环+异步I/O，
+在数百张图片的大批量场景下比线程池开销更低、并发度更高。
+
+用法:
+    # 从JSON文件中批量下载图片
+    python download_batch_images_async.py --input ./data.json --output ./images
+
+    # 调整并发数
+    python download_batch_images_async.py --input ./data.json --output ./images --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# 检查是否安装了依赖
+try:
+    import aiohttp
+except ImportError:
+    print("错误: 需要安装aiohttp包", file=sys.stderr)
+    print("请运行: pip install aiohttp", file=sys.stderr)
+    sys.exit(1)
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None  # 可选依赖，缺失时退化为同步写文件
+
+# 复用线程池版本的任务收集逻辑
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from download_batch_images import collect_download_tasks
+
+# 单次读取的块大小
+CHUNK_SIZE = 65536
+# 图片大小上限（10MB）
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+async def download_image_async(session, url, output_path, timeout=30):
+    """
+    异步下载单张图片
+
+    Args:
+        session: aiohttp.ClientSession
+        url: 图片URL
+        output_path: 输出路径
+        timeout: 请求超时时间（秒）
+
+    Returns:
+        str: 保存的文件路径
+
+    Raises:
+        Exception: 下载失败时抛出异常
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 已下载过的图片直接跳过（部分失败后重跑时不重复下载）
+    if output_path.exists() and output_path.stat().st_size > 0:
+        print(f"已存在，跳过: {output_path}", file=sys.stderr)
+        return str(output_path)
+
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            resp.raise_for_status()
+
+            # 检查内容类型
+            content_type = resp.headers.get('content-type', '')
+            if not content_type.startswith('image/'):
+                raise Exception(f"URL不是图片: {content_type}")
+
+            # 流式写入，边下载边检查大小上限
+            written = 0
+            try:
+                if aiofiles is not None:
+                    async with aiofiles.open(output_path, 'wb') as f:
+                        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                            written += len(chunk)
+                            if written > MAX_IMAGE_SIZE:
+                                raise Exception(f"图片过大: 超过 {MAX_IMAGE_SIZE / 1024 / 1024:.0f}MB")
+                            await f.write(chunk)
+                else:
+                    with open(output_path, 'wb') as f:
+                        async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                            written += len(chunk)
+                            if written > MAX_IMAGE_SIZE:
+                                raise Exception(f"图片过大: 超过 {MAX_IMAGE_SIZE / 1024 / 1024:.0f}MB")
+                            f.write(chunk)
+            except BaseException:
+                # 下载中止（超时/断连/超限/任务取消）时清理残留的半成品文件，
+                # 否则重跑时会被"已存在"检查当成完整图片跳过
+                output_path.unlink(missing_ok=True)
+                raise
+
+        if written == 0:
+            raise Exception("下载的文件为空")
+
+        print(f"成功下载: {output_path} ({written / 1024:.1f}KB)", file=sys.stderr)
+        return str(output_path)
+
+    except asyncio.TimeoutError:
+        raise Exception(f"下载超时: {url}")
+    except aiohttp.ClientError as e:
+        raise Exception(f"下载失败: {str(e)}")
+
+
+async def download_images_async(data_file, output_dir, date_str=None, concurrency=32):
+    """
+    从数据文件中批量异步下载图片
+
+    Args:
+        data_file: JSON数据文件路径
+        output_dir: 输出目录
+        date_str: 日期字符串（用于文件命名）
+        concurrency: 全局最大并发数
+    """
+    # 创建输出目录
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+    # 读取数据
+    with open(data_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # 提取entries列表
+    entries = data.get("entries", data) if isinstance(data, dict) else data
+
+    print(f"找到 {len(entries)} 条数据", file=sys.stderr)
+
+    tasks = collect_download_tasks(entries, output_dir)
+
+    print(f"\n共 {len(tasks)} 张图片待下载（并发数 {concurrency}）", file=sys.stderr)
+
+    # 全局并发上限 + 连接器内置的每主机连接上限和DNS缓存
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=6, ttl_dns_cache=300)
+
+    async def bounded_download(session, idx, img_idx, img_url, output_path):
+        async with semaphore:
+            try:
+                await download_image_async(session, img_url, output_path)
+                return True
+            except Exception as e:
+                print(f"  下载失败 [{idx}-{img_idx}]: {e}", file=sys.stderr)
+                return False
+
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+        results = await asyncio.gather(
+            *[bounded_download(session, idx, img_idx, img_url, output_path)
+              for idx, img_idx, img_url, output_path in tasks],
+            return_exceptions=True
+        )
+
+    success_count = sum(1 for r in results if r is True)
+    fail_count = len(results) - success_count
+
+    print(f"\n下载完成: 成功 {success_count}, 失败 {fail_count}", file=sys.stderr)
+    return success_count, fail_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量下载图片（异步版本）")
+    parser.add_argument("--input", required=True, help="输入JSON文件路径")
+    parser.add_argument("--output", required=True, help="输出目录")
+    parser.add_argument("--date", type=str, help="日期（用于文件命名）")
+    parser.add_argument("--concurrency", type=int, default=32,
+                        help="全局最大并发数（默认32）")
+
+    args = parser.parse_args()
+
+    success, fail = asyncio.run(download_images_async(
+        args.input,
+        args.output,
+        args.date,
+        concurrency=args.concurrency
+    ))
+
+    if fail > 0:
+        sys.exit(1)
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,62 +12,198 @@
 """
 
 import argparse
+import functools
 import os
+import shutil
+import socket
 import sys
 from pathlib import Path
+from urllib.parse import urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-def download_image(url, output_path, timeout=30):
+def _install_dns_cache(maxsize=1024):
+    """
+    缓存DNS解析结果（进程级）
+
+    批量下载时URL集中在少数主机上，缓存后每个主机整个运行周期
+    只做一次getaddrinfo系统调用。重复安装时为空操作。
+    """
+    if getattr(socket.getaddrinfo, '_dns_cached', False):
+        return
+
+    original_getaddrinfo = socket.getaddrinfo
+
+    @functools.lru_cache(maxsize=maxsize)
+    def cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+        return original_getaddrinfo(host, port, family, type, proto, flags)
+
+    cached_getaddrinfo._dns_cached = True
+    socket.getaddrinfo = cached_getaddrinfo
+
+
+_install_dns_cache()
+
+
+# 图片大小上限（10MB）
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+# 单次读取的块大小（64KiB，减少Python层循环次数）
+CHUNK_SIZE = 65536
+# 输出文件的写缓冲大小（1MiB，合并write系统调用）
+WRITE_BUFFER_SIZE = 1 << 20
+# 扩展名明确是图片的后缀，直接GET无需HEAD预检
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.webp'}
+
+
+def _create_session():
+    """创建带连接池和重试策略的Session（同一主机复用TCP/TLS连接）"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        # 瞬时失败（连接重置、5xx、429）在urllib3层指数退避重试，
+        # 不再上抛到每张图片的异常处理
+        max_retries=Retry(
+            total=4,
+            connect=3,
+            read=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    # 显式声明压缩支持；br需要brotli包解码，未安装时不声明
+    try:
+        import brotli  # noqa: F401
+        accept_encoding = 'gzip, deflate, br'
+    except ImportError:
+        accept_encoding = 'gzip, deflate'
+
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept-Encoding': accept_encoding
+    })
+    return session
+
+
+# 模块级共享Session，批量下载时复用连接
+_SESSION = _create_session()
+
+
+@functools.lru_cache(maxsize=256)
+def _ensure_dir(output_dir):
+    """创建输出目录，同一目录只执行一次mkdir/stat系统调用"""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+
+def download_image(url, output_path, timeout=30, session=None):
     """
     下载图片到本地
-    
+
     Args:
         url: 图片URL
         output_path: 输出路径
         timeout: 请求超时时间（秒）
-    
+        session: 可选的requests.Session（默认使用模块级共享Session）
+
     Returns:
         str: 保存的文件路径
-    
+
     Raises:
         Exception: 下载失败时抛出异常
     """
-    # 创建输出目录
+    # 创建输出目录（按目录缓存，批量下载时每个目录只mkdir一次）
     output_dir = os.path.dirname(output_path)
     if output_dir:
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-    
-    # 发送请求
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
+        _ensure_dir(output_dir)
+
+    if session is None:
+        session = _SESSION
+
     try:
-        response = requests.get(url, headers=headers, timeout=timeout, stream=True)
+        # 扩展名看不出是图片时，先用HEAD预检（一个RTT、零正文），
+        # 坏URL不必拉取正文；明确的图片后缀直接GET，省掉这个RTT
+        ext = Path(urlparse(url).path).suffix.lower()
+        if ext not in IMAGE_SUFFIXES:
+            try:
+                head = session.head(url, allow_redirects=True, timeout=min(timeout, 5))
+                if head.ok:
+                    head_type = head.headers.get('content-type', '')
+                    if head_type and not head_type.startswith('image/'):
+                        raise Exception(f"URL不是图片: {head_type}")
+                    head_length = int(head.headers.get('content-length', 0))
+                    if head_length > MAX_IMAGE_SIZE:
+                        raise Exception(f"图片过大: {head_length / 1024 / 1024:.2f}MB")
+            except requests.exceptions.RequestException:
+                pass  # 服务器不支持HEAD时照常走GET验证
+
+        response = session.get(url, timeout=timeout, stream=True)
         response.raise_for_status()
         
         # 检查内容类型
         content_type = response.headers.get('content-type', '')
         if not content_type.startswith('image/'):
             raise Exception(f"URL不是图片: {content_type}")
-        
-        # 获取文件大小
+
+        # 根据头部先行检查大小（分块传输时服务器可能不给Content-Length）
         content_length = int(response.headers.get('content-length', 0))
-        if content_length > 10 * 1024 * 1024:  # 限制10MB
+        if content_length > MAX_IMAGE_SIZE:
             raise Exception(f"图片过大: {content_length / 1024 / 1024:.2f}MB")
-        
-        # 保存文件
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-        
+
+        # 流式保存；1MiB写缓冲把小块写入合并成大的write()系统调用
+        written = 0
+        try:
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                if 0 < content_length <= MAX_IMAGE_SIZE:
+                    # 大小已知且合规：copyfileobj在C层循环拷贝，
+                    # 没有每块一次的Python开销
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f, length=CHUNK_SIZE)
+                    written = f.tell()
+                elif not response.headers.get('content-encoding'):
+                    # 大小未知且未压缩：readinto复用同一块缓冲区，
+                    # 避免iter_content每块新建bytes对象的拷贝和分配
+                    buf = bytearray(CHUNK_SIZE)
+                    view = memoryview(buf)
+                    while True:
+                        n = response.raw.readinto(buf)
+                        if not n:
+                            break
+                        written += n
+                        if written > MAX_IMAGE_SIZE:
+                            raise Exception(
+                                f"图片过大: 已超过 {MAX_IMAGE_SIZE / 1024 / 1024:.0f}MB"
+                            )
+                        f.write(view[:n])
+                else:
+                    # 大小未知且带压缩编码：iter_content负责解码
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        if chunk:
+                            written += len(chunk)
+                            if written > MAX_IMAGE_SIZE:
+                                raise Exception(
+                                    f"图片过大: 已超过 {MAX_IMAGE_SIZE / 1024 / 1024:.0f}MB"
+                                )
+                            f.write(chunk)
+        except Exception:
+            # 下载中止时清理残留的半成品文件
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+        finally:
+            # 中途中止时关闭响应，让连接池回收连接
+            response.close()
+
         # 验证文件大小
-        file_size = os.path.getsize(output_path)
-        if file_size == 0:
+        if written == 0:
             raise Exception("下载的文件为空")
+        file_size = written
         
         print(f"成功下载: {output_path} ({file_size / 1024:.1f}KB)", file=sys.stderr)
         return output_path
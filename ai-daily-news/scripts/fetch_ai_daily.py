@@ -8,7 +8,10 @@ import argparse
 import json
 import os
 import re
+import shutil
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from urllib.parse import urljoin, urlparse
@@ -17,6 +20,101 @@ import feedparser
 import requests
 from bs4 import BeautifulSoup
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson的C编码器序列化比stdlib json快数倍，未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps_pretty(obj) -> str:
+    """带缩进序列化为JSON字符串（优先orjson）"""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# requests_cache提供按URL的磁盘响应缓存，重跑/调试时HN抓取和
+# ArXiv图片抽取直接命中缓存；未安装时退化为普通Session
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+
+# ====================== HTTP会话 ======================
+def _create_session() -> requests.Session:
+    """创建带连接池的共享Session，对同一主机复用keep-alive连接
+
+    安装了requests_cache时，GET响应落盘缓存6小时，同一URL的
+    重复抓取（每日运行、调试重跑）不再发起HTTP请求。
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cache_name='.ai_daily_cache',
+            backend='sqlite',
+            expire_after=timedelta(hours=6),
+            allowable_methods=['GET']
+        )
+    else:
+        session = requests.Session()
+    # 瞬时失败（连接重置、429/5xx）在urllib3层指数退避重试，并按
+    # Retry-After头等待；pool_maxsize配合pool_block=True把对单主机的
+    # 并发连接压到8以内（不加pool_block时urllib3会在池满后开溢出连接，
+    # 上限形同虚设），避免并行抓取时把ArXiv/36kr等单一主机打挂
+    retry = Retry(
+        total=3,
+        connect=2,
+        read=2,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['GET'],
+        respect_retry_after_header=True
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry,
+        pool_connections=16,
+        pool_maxsize=8,
+        pool_block=True
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    })
+    return session
+
+
+# 模块级共享Session：HN的OG探测、ArXiv HTML抓取、图片下载等
+# 大量请求集中在少数主机，复用连接省去每次TCP+TLS握手
+SESSION = _create_session()
+
+# lxml是libxml2的C绑定，构建DOM比纯Python的html.parser快5-10倍，
+# 内存占用也更低；未安装时回退到html.parser
+try:
+    import lxml  # noqa: F401
+    from lxml import etree as lxml_etree
+    from lxml import html as lxml_html
+    HTML_PARSER = 'lxml'
+except ImportError:
+    lxml_etree = None
+    lxml_html = None
+    HTML_PARSER = 'html.parser'
+
+# ArXiv Atom feed的命名空间
+ATOM_NS = {'a': 'http://www.w3.org/2005/Atom'}
+
+# 关键词过滤预编译为单个正则（C层单次扫描，替代逐关键词的in循环）
+# AI相关关键词：标题须命中其一
+AI_RE = re.compile(r'AI|人工智能|机器学习|深度学习|LLM|大模型|智能|ChatGPT|GPT')
+# 导航、页脚等非新闻链接：命中即跳过
+SKIP_RE = re.compile(r'登录|注册|首页|关于|联系|友情链接|广告|合作|招聘')
+# 公式图/小图标的src特征：命中即跳过（re.I避免每次src.lower()分配新串）
+FORMULA_ICON_RE = re.compile(r'formula|inline|math|tex|equation|icon', re.I)
 
 # ====================== 配置 ======================
 # 默认使用阿里云百炼 qwen 模型
@@ -48,7 +146,31 @@ PREDEFINED_SOURCES = {
 }
 
 # ====================== Hacker News API ======================
-def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
+def _fetch_og_image(url: str, session: requests.Session = SESSION) -> Optional[str]:
+    """抓取页面的og:image地址，失败返回None
+
+    og:image在<head>里，前16KB足以覆盖全部<meta>标签；用Range头
+    加流式读取只取开头一段，不为一个meta标签拉整页HTML（媒体站
+    页面可达数MB）。服务器忽略Range时也只读前16KB就关闭连接。
+    """
+    try:
+        with session.get(url, timeout=5, allow_redirects=True, stream=True,
+                         headers={'Range': 'bytes=0-16383'}) as page_resp:
+            if page_resp.status_code not in (200, 206):
+                return None
+            head_bytes = page_resp.raw.read(16384, decode_content=True)
+
+        soup = BeautifulSoup(head_bytes, HTML_PARSER)
+        og_image = soup.find('meta', property='og:image')
+        if og_image and og_image.get('content'):
+            return og_image['content']
+    except Exception:
+        pass
+    return None
+
+
+def fetch_hacker_news(limit: int = 10, days_back: int = 1,
+                      session: requests.Session = SESSION) -> List[Dict]:
     """从Hacker News获取AI相关新闻"""
     base_url = "https://hn.algolia.com/api/v1/search"
     
@@ -57,7 +179,7 @@ def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
     
     try:
         # 获取数据，按points排序获取热门内容
-        response = requests.get(base_url, params={
+        response = session.get(base_url, params={
             "query": query,
             "tags": "story",
             "hitsPerPage": limit * 20  # 获取更多数据以便筛选
@@ -74,8 +196,8 @@ def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
         # 按points排序后过滤
         hits_sorted = sorted(hits, key=lambda x: x.get("points", 0), reverse=True)
         
-        # 过滤和转换结果
-        entries = []
+        # 第一步：过滤出入选条目（去重+时间过滤）
+        accepted = []
         seen_urls = set()
         
         for hit in hits_sorted:
@@ -96,18 +218,20 @@ def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
             else:
                 created_at = datetime.utcnow()  # fallback
             
-            # 提取图片（从OG标签）
-            image = None
-            try:
-                page_resp = requests.get(url, timeout=5, allow_redirects=True)
-                if page_resp.status_code == 200:
-                    soup = BeautifulSoup(page_resp.text, 'html.parser')
-                    og_image = soup.find('meta', property='og:image')
-                    if og_image and og_image.get('content'):
-                        image = og_image['content']
-            except:
-                pass
+            accepted.append((hit, url, created_at))
             
+            if len(accepted) >= limit:
+                break
+        
+        # 第二步：并行抓取OG图片（每条都是独立的阻塞I/O，串行时占大头）
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            images = list(executor.map(
+                lambda u: _fetch_og_image(u, session),
+                [url for _, url, _ in accepted]
+            ))
+        
+        entries = []
+        for (hit, url, created_at), image in zip(accepted, images):
             entries.append({
                 "title": hit.get("title", "No title"),
                 "url": url,
@@ -118,9 +242,6 @@ def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
                 "type": "news",
                 "image": image
             })
-            
-            if len(entries) >= limit:
-                break
         
         print(f"✓ 从 Hacker News 获取 {len(entries)} 条新闻")
         return entries
@@ -131,10 +252,77 @@ def fetch_hacker_news(limit: int = 10, days_back: int = 1) -> List[Dict]:
 
 
 # ====================== ArXiv API ======================
+# 跨运行记录已处理过的论文ID：每日运行时20篇里通常只有1-2篇是新的，
+# 老论文跳过图片抽取（每篇一次HTTP+整页解析，是最重的单篇操作）
+SEEN_ARXIV_IDS_FILE = ".seen_arxiv_ids.json"
+
+
+def _load_seen_arxiv_ids() -> set:
+    """读取历史运行已处理过的ArXiv ID集合，文件缺失或损坏时为空集"""
+    try:
+        with open(SEEN_ARXIV_IDS_FILE, 'r', encoding='utf-8') as f:
+            return set(json.load(f))
+    except (OSError, ValueError):
+        return set()
+
+
+def _save_seen_arxiv_ids(ids: set) -> None:
+    """写回已处理的ArXiv ID集合（尽力而为，失败不影响主流程）"""
+    try:
+        with open(SEEN_ARXIV_IDS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(sorted(ids), f)
+    except OSError:
+        pass
+
+
+def _parse_arxiv_feed(content: bytes) -> List[Dict]:
+    """把ArXiv的Atom响应解析成统一的条目字典列表
+
+    ArXiv的Atom schema稳定，lxml.etree在libxml2的C层直接取字段，
+    跳过feedparser纯Python的通用RSS规范化和dict-of-dicts物化；
+    lxml未安装时回退到feedparser。
+    """
+    parsed_entries = []
+
+    if lxml_etree is not None:
+        root = lxml_etree.fromstring(content)
+        for e in root.findall('a:entry', ATOM_NS):
+            published = e.findtext('a:published', default='', namespaces=ATOM_NS)
+            try:
+                pub_date = (datetime.fromisoformat(published.rstrip('Z'))
+                            if published else datetime.utcnow())
+            except ValueError:
+                pub_date = datetime.utcnow()
+
+            parsed_entries.append({
+                "id": e.findtext('a:id', default='', namespaces=ATOM_NS),
+                "title": e.findtext('a:title', default='', namespaces=ATOM_NS),
+                "summary": e.findtext('a:summary', default='', namespaces=ATOM_NS),
+                "published": pub_date,
+                "authors": [name.text or ''
+                            for name in e.findall('a:author/a:name', ATOM_NS)],
+            })
+        return parsed_entries
+
+    feed = feedparser.parse(content)
+    for entry in feed.entries:
+        # feedparser解析时已生成published_parsed（struct_time），直接复用
+        parsed = entry.get("published_parsed")
+        parsed_entries.append({
+            "id": entry.get("id", ""),
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", ""),
+            "published": datetime(*parsed[:6]) if parsed else datetime.utcnow(),
+            "authors": [author.name for author in entry.get("authors", [])],
+        })
+    return parsed_entries
+
+
 def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning", 
                        limit: int = 10,
                        max_results: int = 20,
-                       target_date: Optional[str] = None) -> List[Dict]:
+                       target_date: Optional[str] = None,
+                       session: requests.Session = SESSION) -> List[Dict]:
     """从ArXiv获取最新论文（默认最近一个月）"""
     base_url = "http://export.arxiv.org/api/query"
     
@@ -148,10 +336,10 @@ def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning
     }
     
     try:
-        response = requests.get(base_url, params=params, timeout=15)
+        response = session.get(base_url, params=params, timeout=15)
         response.raise_for_status()
         
-        feed = feedparser.parse(response.content)
+        feed_entries = _parse_arxiv_feed(response.content)
         
         entries = []
         seen_ids = set()
@@ -159,22 +347,14 @@ def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning
         # 计算一个月前的日期
         one_month_ago = datetime.utcnow() - timedelta(days=30)
         
-        for entry in feed.entries[:max_results]:
+        for entry in feed_entries[:max_results]:
             # 提取ArXiv ID
-            arxiv_id = entry.get("id", "").split("/abs/")[-1].split("/v")[0]
+            arxiv_id = entry["id"].split("/abs/")[-1].split("/v")[0]
             if arxiv_id in seen_ids:
                 continue
             seen_ids.add(arxiv_id)
             
-            # 解析日期
-            published = entry.get("published")
-            try:
-                if published:
-                    pub_date = datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ")
-                else:
-                    pub_date = datetime.utcnow()
-            except:
-                pub_date = datetime.utcnow()
+            pub_date = entry["published"]
             
             # 日期过滤
             if target_date:
@@ -192,16 +372,13 @@ def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning
                     continue
             
             # 提取摘要
-            summary = entry.get("summary", "").replace("\n", " ").strip()
+            summary = entry["summary"].replace("\n", " ").strip()
             
             # 提取作者
-            authors = ", ".join([author.name for author in entry.get("authors", [])])
-            
-            # 抽取图片（从HTML页面）
-            images = extract_arxiv_images(arxiv_id)
+            authors = ", ".join(entry["authors"])
             
             entries.append({
-                "title": entry.get("title", ""),
+                "title": entry["title"],
                 "url": f"https://arxiv.org/abs/{arxiv_id}",
                 "arxiv_id": arxiv_id,
                 "summary": summary[:300] + "..." if len(summary) > 300 else summary,
@@ -209,12 +386,33 @@ def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning
                 "published": pub_date.strftime("%Y-%m-%d"),
                 "source": "arxiv",
                 "type": "paper",
-                "images": images  # 支持多张图片
+                "images": []  # 支持多张图片，下面并行填充
             })
             
             if len(entries) >= limit:
                 break
         
+        # 图片抽取推迟到筛选完成后并行执行：每篇论文一次HTML请求，
+        # 都打同一主机，keep-alive+并发让整个阶段≈一次请求的耗时。
+        # 往期运行见过的ID直接跳过，抽取量从max_results降到新论文数
+        if entries:
+            seen_before = _load_seen_arxiv_ids()
+            new_entries = [e for e in entries if e["arxiv_id"] not in seen_before]
+            
+            if new_entries:
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    images_list = list(executor.map(
+                        lambda aid: extract_arxiv_images(aid, session=session),
+                        [e["arxiv_id"] for e in new_entries]
+                    ))
+                for entry_dict, images in zip(new_entries, images_list):
+                    entry_dict["images"] = images
+            
+            if len(new_entries) < len(entries):
+                print(f"  跳过 {len(entries) - len(new_entries)} 篇已处理过的论文的图片抽取")
+            
+            _save_seen_arxiv_ids(seen_before | {e["arxiv_id"] for e in entries})
+        
         print(f"✓ 从 ArXiv 获取 {len(entries)} 篇论文")
         return entries
     
@@ -223,18 +421,21 @@ def fetch_arxiv_papers(query: str = "artificial intelligence OR machine learning
         return []
 
 
-def extract_arxiv_images(arxiv_id: str) -> List[str]:
+def extract_arxiv_images(arxiv_id: str,
+                         session: requests.Session = SESSION) -> List[str]:
     """从ArXiv论文HTML页面提取架构图和流程图"""
     try:
         # 访问ArXiv HTML版本（注意：添加trailing slash以确保urljoin正确工作）
         html_url = f"https://arxiv.org/html/{arxiv_id}/"
-        response = requests.get(html_url, timeout=10)
+        response = session.get(html_url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # 传bytes让解析器自行嗅探编码，省去一次Python层解码
+        soup = BeautifulSoup(response.content, HTML_PARSER)
         
-        # 查找所有图片
+        # 查找所有图片（保持文档顺序：页面靠前的通常是架构图）
         images = []
+        seen_srcs = set()
         for img in soup.find_all('img'):
             src = img.get('src', '')
             
@@ -251,27 +452,33 @@ def extract_arxiv_images(arxiv_id: str) -> List[str]:
                 # 相对路径，使用urljoin处理
                 image_url = urljoin(html_url, src)
             
-            # 过滤掉公式图（通常包含 formula、inline 等关键词）
-            if any(keyword in src.lower() for keyword in ['formula', 'inline', 'math', 'tex', 'equation']):
-                continue
-            
-            # 过滤掉小图标（通常文件名包含 icon）
-            if 'icon' in src.lower():
+            # 过滤掉公式图和小图标（src通常含formula/inline/icon等关键词）
+            if FORMULA_ICON_RE.search(src):
                 continue
             
-            # 获取图片尺寸
-            width = int(img.get('width', 0)) or int(img.get('data-width', 0)) or 0
-            height = int(img.get('height', 0)) or int(img.get('data-height', 0)) or 0
+            # 获取图片尺寸。多数ArXiv图片不带width/height属性（尺寸由
+            # CSS控制），属性缺失或非纯数字（如"100%"）时跳过尺寸过滤，
+            # 而不是让int()抛异常丢掉整篇论文的图片
+            w_attr = img.get('width') or img.get('data-width')
+            h_attr = img.get('height') or img.get('data-height')
+            width = int(w_attr) if w_attr and str(w_attr).isdigit() else 0
+            height = int(h_attr) if h_attr and str(h_attr).isdigit() else 0
             
             # 只保留较大的图片（可能是架构图或流程图）
             if width > 0 and height > 0:
                 if width < 200 or height < 200:
                     continue
             
+            # 按插入顺序去重，凑满5张就停止扫描
+            if image_url in seen_srcs:
+                continue
+            seen_srcs.add(image_url)
             images.append(image_url)
+            if len(images) >= 5:
+                break
         
-        # 最多返回5张图片
-        return list(set(images))[:5]  # 去重后最多5张
+        # 最多返回5张图片（保持页面中出现的顺序）
+        return images
     
     except Exception as e:
         print(f"  ⚠ 无法提取 {arxiv_id} 的图片: {e}")
@@ -281,15 +488,13 @@ def extract_arxiv_images(arxiv_id: str) -> List[str]:
 # ====================== 自定义新闻源 ======================
 def fetch_custom_news_source(custom_url: str, 
                              source_name: str = "custom",
-                             limit: int = 10) -> List[Dict]:
+                             limit: int = 10,
+                             session: requests.Session = SESSION) -> List[Dict]:
     """从自定义URL获取新闻（支持JSON API和RSS/Atom feed）"""
-    
+
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        response = requests.get(custom_url, headers=headers, timeout=10)
+        # User-Agent已设置在共享Session上
+        response = session.get(custom_url, timeout=10)
         response.raise_for_status()
         
         # 尝试解析为RSS/Atom feed
@@ -355,11 +560,11 @@ def fetch_custom_news_source(custom_url: str,
                             try:
                                 pub_time = datetime.strptime(published[:30], fmt)
                                 break
-                            except:
+                            except ValueError:
                                 continue
                     else:
                         pub_time = published
-                except:
+                except (TypeError, ValueError):
                     pub_time = datetime.utcnow()
                 
                 # 尝试提取图片
@@ -388,7 +593,26 @@ def fetch_custom_news_source(custom_url: str,
 
 
 # ====================== 国内新闻源解析 ======================
-def fetch_domestic_news(source_key: str, limit: int = 10) -> List[Dict]:
+def _iter_candidate_links(content):
+    """产出页面中的(标题, href)候选链接对
+
+    lxml可用时用XPath在libxml2的C层完成href存在性和标题长度的
+    初筛，短标题根本不进入Python层；否则回退到BeautifulSoup。
+    """
+    if lxml_html is not None:
+        tree = lxml_html.fromstring(content)
+        nodes = tree.xpath(
+            '//a[@href and string-length(normalize-space(.)) >= 10]')
+        for node in nodes:
+            yield node.text_content().strip(), node.get('href', '')
+    else:
+        soup = BeautifulSoup(content, HTML_PARSER)
+        for link in soup.select('a[href]'):
+            yield link.get_text(strip=True), link.get('href', '')
+
+
+def fetch_domestic_news(source_key: str, limit: int = 10,
+                        session: requests.Session = SESSION) -> List[Dict]:
     """从预设的国内新闻源获取AI相关新闻"""
     
     if source_key not in PREDEFINED_SOURCES:
@@ -400,42 +624,26 @@ def fetch_domestic_news(source_key: str, limit: int = 10) -> List[Dict]:
     source_name = source["name"]
     
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        # User-Agent已设置在共享Session上
+        response = session.get(url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
         entries = []
         
-        # AI关键词过滤
-        ai_keywords = ['AI', '人工智能', '机器学习', '深度学习', 'LLM', '大模型', '智能', 'ChatGPT', 'GPT']
-        
         # 通用解析：查找所有带标题和链接的元素
         seen_urls = set()
-        link_count = 0
         
-        for link in soup.find_all('a', href=True):
-            if link_count >= limit * 3:  # 多获取一些以便筛选
-                break
-            
-            href = link.get('href', '')
-            title = link.get_text(strip=True)
-            
+        for title, href in _iter_candidate_links(response.content):
             # 过滤掉太短的标题和不是新闻的链接
             if len(title) < 10 or len(title) > 100 or not href:
                 continue
             
             # 过滤掉导航、页脚等链接
-            skip_keywords = ['登录', '注册', '首页', '关于', '联系', '友情链接', '广告', '合作', '招聘']
-            if any(keyword in title for keyword in skip_keywords):
+            if SKIP_RE.search(title):
                 continue
             
             # 只保留包含AI相关关键词的标题
-            if not any(keyword in title for keyword in ai_keywords):
+            if not AI_RE.search(title):
                 continue
             
             # 去重
@@ -456,8 +664,6 @@ def fetch_domestic_news(source_key: str, limit: int = 10) -> List[Dict]:
                 "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             })
             
-            link_count += 1
-            
             if len(entries) >= limit:
                 break
         
@@ -478,29 +684,16 @@ def merge_and_sort_entries(hn_entries: List[Dict],
                           domestic_entries: List[Dict] = None) -> List[Dict]:
     """合并并排序所有条目"""
     
-    all_entries = hn_entries + arxiv_entries
-    
-    # 添加自定义源数据
-    if custom_entries:
-        all_entries += custom_entries
-    
-    # 添加国内新闻源数据
-    if domestic_entries:
-        all_entries += domestic_entries
-    
-    # 按时间排序
-    sorted_entries = sorted(all_entries, key=lambda x: x.get('created_at', ''), reverse=True)
-    
-    # 去重（基于URL）
-    seen = set()
-    unique_entries = []
-    for entry in sorted_entries:
+    # 合并时按URL去重（dict保持插入顺序，同一URL首次出现者保留），
+    # 然后只排一次序——原来是先全量排序再二次遍历去重
+    by_url = {}
+    for entry in hn_entries + arxiv_entries + (custom_entries or []) + (domestic_entries or []):
         url = entry.get('url', '')
-        if url not in seen:
-            seen.add(url)
-            unique_entries.append(entry)
-    
-    return unique_entries
+        if url not in by_url:
+            by_url[url] = entry
+
+    # 按时间排序
+    return sorted(by_url.values(), key=lambda x: x.get('created_at', ''), reverse=True)
 
 
 # ====================== 文章生成 ======================
@@ -558,25 +751,59 @@ def generate_article(entries: List[Dict],
         
         client = OpenAI(**client_kwargs)
         
-        # 调用模型
-        response = client.chat.completions.create(
+        # 调用模型（流式输出：token一到就打印，首字延迟从整篇生成
+        # 时间降到首token延迟）
+        stream = client.chat.completions.create(
             model=model,
             messages=[
                 {"role": "system", "content": "你是一个专业的AI领域评论员，擅长分析技术趋势和撰写深度文章。"},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.7,
-            max_tokens=2000
+            max_tokens=2000,
+            stream=True
         )
-        
-        article = response.choices[0].message.content
-        
+
+        chunks = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                delta = chunk.choices[0].delta.content
+                print(delta, end='', flush=True)
+                chunks.append(delta)
+        print()
+
+        article = ''.join(chunks)
+
         print(f"✓ 文章生成成功 ({len(article)} 字符)")
         return article
     
     except Exception as e:
         print(f"✗ 文章生成失败: {e}")
-        return f"文章生成遇到错误，以下是原始数据：\n\n{json.dumps(entries, indent=2, ensure_ascii=False)}"
+        return f"文章生成遇到错误，以下是原始数据：\n\n{_dumps_pretty(entries)}"
+
+
+# ====================== 图片下载 ======================
+def _download_one(image_url: str, filepath: str,
+                  session: requests.Session = SESSION) -> bool:
+    """下载单张图片到本地（流式写盘），成功返回True"""
+    # 已存在则跳过，重跑时不重复下载
+    if os.path.exists(filepath) and os.path.getsize(filepath) > 0:
+        print(f"  - 已存在，跳过: {os.path.basename(filepath)}")
+        return True
+    
+    try:
+        with session.get(image_url, timeout=10, stream=True) as img_resp:
+            if img_resp.status_code != 200:
+                return False
+            # 流式分块写盘，不把整张图读进内存
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(img_resp.raw, f, length=64 * 1024)
+        
+        print(f"  ✓ 下载图片: {os.path.basename(filepath)}")
+        return True
+    except Exception as e:
+        print(f"  ✗ 下载图片失败 ({image_url}): {e}")
+        return False
 
 
 # ====================== 主程序 ======================
@@ -626,9 +853,16 @@ def main():
                        help=f"回溯天数 (默认: 1)")
     parser.add_argument("--download-images", action="store_true",
                        help="下载所有图片到本地目录")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="清空磁盘响应缓存，强制重新抓取")
     
     args = parser.parse_args()
     
+    # 强制刷新：清空磁盘缓存后照常抓取
+    if args.no_cache and hasattr(SESSION, 'cache'):
+        SESSION.cache.clear()
+        print("已清空响应缓存")
+    
     # 显示配置信息
     print("=" * 60)
     print("AI热点新闻聚合工具")
@@ -649,31 +883,33 @@ def main():
         print(f"📰 国内源: {args.domestic_limit} 条")
     print("=" * 60)
     
-    # 获取数据
-    hn_entries = []
-    if not args.no_hacker_news:
-        hn_entries = fetch_hacker_news(limit=args.hn_limit, days_back=args.days_back)
-    
-    arxiv_entries = []
-    if not args.no_arxiv:
-        arxiv_entries = fetch_arxiv_papers(limit=args.arxiv_limit, max_results=20, target_date=args.date)
-    
-    # 获取自定义源数据
-    custom_entries = []
-    if args.custom_url:
-        custom_entries = fetch_custom_news_source(
-            args.custom_url,
-            source_name=args.custom_source,
-            limit=args.custom_limit
-        )
-    
-    # 获取国内新闻源数据
-    domestic_entries = []
-    if args.domestic_source:
-        domestic_entries = fetch_domestic_news(
-            args.domestic_source,
-            limit=args.domestic_limit
-        )
+    # 获取数据：各数据源互不依赖且访问不同主机，并行拉取后
+    # 总耗时约等于最慢的一个源，而不是各源之和
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {}
+        if not args.no_hacker_news:
+            futures['hn'] = executor.submit(
+                fetch_hacker_news, limit=args.hn_limit, days_back=args.days_back)
+        if not args.no_arxiv:
+            futures['arxiv'] = executor.submit(
+                fetch_arxiv_papers, limit=args.arxiv_limit, max_results=20,
+                target_date=args.date)
+        if args.custom_url:
+            futures['custom'] = executor.submit(
+                fetch_custom_news_source, args.custom_url,
+                source_name=args.custom_source, limit=args.custom_limit)
+        if args.domestic_source:
+            futures['domestic'] = executor.submit(
+                fetch_domestic_news, args.domestic_source,
+                limit=args.domestic_limit)
+        
+        # 各fetch_*内部已捕获异常并返回[]，这里只需收集结果
+        results = {name: future.result() for name, future in futures.items()}
+    
+    hn_entries = results.get('hn', [])
+    arxiv_entries = results.get('arxiv', [])
+    custom_entries = results.get('custom', [])
+    domestic_entries = results.get('domestic', [])
     
     # 整合数据
     all_entries = merge_and_sort_entries(hn_entries, arxiv_entries, custom_entries, domestic_entries)
@@ -682,60 +918,46 @@ def main():
     if args.download_images:
         os.makedirs(args.image_output_dir, exist_ok=True)
         
-        image_count = 0
+        # 先收集(url, 路径)任务，再并行流式下载。单张图片（Hacker News
+        # 的image）和多张图片（ArXiv的images）统一平铺进同一个任务列表，
+        # 文件名在这里算好，worker只做纯I/O
+        download_tasks = []
         for entry in all_entries:
-            # 处理单张图片 (Hacker News)
-            image_url = entry.get('image')
-            if image_url:
-                try:
-                    img_resp = requests.get(image_url, timeout=5)
-                    if img_resp.status_code == 200:
-                        # 生成文件名
-                        ext = os.path.splitext(urlparse(image_url).path)[1] or '.jpg'
-                        filename = f"{entry['source']}_{entry['type']}_0{ext}"
-                        filepath = os.path.join(args.image_output_dir, filename)
-                        
-                        with open(filepath, 'wb') as f:
-                            f.write(img_resp.content)
-                        
-                        print(f"  ✓ 下载图片: {filename}")
-                        image_count += 1
-                except Exception as e:
-                    print(f"  ✗ 下载图片失败 ({image_url}): {e}")
-            
-            # 处理多张图片 (ArXiv)
-            images = entry.get('images', [])
-            for i, image_url in enumerate(images):
-                try:
-                    img_resp = requests.get(image_url, timeout=5)
-                    if img_resp.status_code == 200:
-                        # 生成文件名
-                        ext = os.path.splitext(urlparse(image_url).path)[1] or '.jpg'
-                        filename = f"{entry['source']}_{entry['type']}_0{i+1}{ext}"
-                        filepath = os.path.join(args.image_output_dir, filename)
-                        
-                        with open(filepath, 'wb') as f:
-                            f.write(img_resp.content)
-                        
-                        print(f"  ✓ 下载图片: {filename}")
-                        image_count += 1
-                except Exception as e:
-                    print(f"  ✗ 下载图片失败 ({image_url}): {e}")
+            urls = []
+            if entry.get('image'):
+                urls.append((entry['image'], '0'))
+            urls.extend((u, f'0{i+1}')
+                        for i, u in enumerate(entry.get('images') or []))
+            
+            for image_url, tag in urls:
+                ext = os.path.splitext(urlparse(image_url).path)[1] or '.jpg'
+                filename = f"{entry['source']}_{entry['type']}_{tag}{ext}"
+                download_tasks.append(
+                    (image_url, os.path.join(args.image_output_dir, filename)))
+        
+        image_count = 0
+        if download_tasks:
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = executor.map(
+                    lambda task: _download_one(task[0], task[1]), download_tasks)
+                image_count = sum(1 for ok in results if ok)
         
         print(f"✓ 共下载 {image_count} 张图片到 {args.image_output_dir}/")
     
-    # 输出JSON
+    # 输出JSON（类型统计单次遍历完成，序列化优先走orjson的C编码器）
+    type_counts = Counter(e.get('type', '?') for e in all_entries)
+    payload = {
+        "date": args.date or datetime.now().strftime("%Y-%m-%d"),
+        "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "entries": all_entries,
+        "stats": {
+            "total": len(all_entries),
+            "news": type_counts.get('news', 0),
+            "papers": type_counts.get('paper', 0)
+        }
+    }
     with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump({
-            "date": args.date or datetime.now().strftime("%Y-%m-%d"),
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "entries": all_entries,
-            "stats": {
-                "total": len(all_entries),
-                "news": len([e for e in all_entries if e.get('type') == 'news']),
-                "papers": len([e for e in all_entries if e.get('type') == 'paper'])
-            }
-        }, f, indent=2, ensure_ascii=False)
+        f.write(_dumps_pretty(payload))
     
     print(f"✓ 数据已保存到 {args.output}")
     print("=" * 60)
@@ -743,11 +965,11 @@ def main():
     # 生成文章
     if not args.no_article:
         print("\n🤖 正在生成文章...\n")
-        article = generate_article(all_entries, model=args.model, base_url=args.base_url, date=args.date)
-        print("\n" + "=" * 60)
+        print("=" * 60)
         print("生成的文章:")
         print("=" * 60)
-        print(article)
+        # 文章内容由generate_article流式打印，这里不再整篇重复输出
+        article = generate_article(all_entries, model=args.model, base_url=args.base_url, date=args.date)
         print("=" * 60)
         
         # 保存文章
@@ -56,17 +56,17 @@ def fetch_news_tushare(limit: int = 100, token: str = None) -> List[Dict[str, An
             print("警告: 未获取到新闻数据", file=sys.stderr)
             return []
 
-        # 转换数据格式
-        news_list = []
-        for idx, row in df.head(limit).iterrows():
-            news_item = {
-                "title": str(row.get("title", "")),
-                "content": str(row.get("content", "")),
-                "time": str(row.get("datetime", "")),
-                "source": str(row.get("source", "")),
-                "url": str(row.get("url", ""))
-            }
-            news_list.append(news_item)
+        # 转换数据格式：在pandas的C层一次性完成，
+        # 避免iterrows逐行装箱Series的开销
+        cols = ["title", "content", "datetime", "source", "url"]
+        news_list = (
+            df.head(limit)
+            .reindex(columns=cols)  # 缺失列补NaN，保证字段齐全
+            .fillna("")
+            .astype(str)
+            .rename(columns={"datetime": "time"})
+            .to_dict(orient="records")
+        )
 
         print(f"成功获取 {len(news_list)} 条新闻", file=sys.stderr)
         return news_list
@@ -8,34 +8,106 @@
 """
 
 import argparse
+import functools
 import json
 import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 
+# orjson序列化比stdlib json快数倍，未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow可选：Table.to_pylist()在列式C路径上生成记录，
+# 绕开pandas Block Manager逐行装箱的开销；未安装时回退to_dict
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def _records(df) -> List[Dict[str, Any]]:
+    """DataFrame转记录列表（优先pyarrow列式路径）"""
+    if pyarrow is not None:
+        return pyarrow.Table.from_pandas(df, preserve_index=False).to_pylist()
+    return df.to_dict(orient="records")
+
+
+# 列名映射表在模块加载时构建一次，避免每次调用重建字典/列表
+_TUSHARE_RENAME = {
+    "trade_date": "date",
+    "vol": "volume",
+    "pct_chg": "change_percent",
+}
+_TUSHARE_NUM_COLS = ["open", "close", "high", "low", "volume", "amount", "change_percent"]
+
+_AKSHARE_RENAME = {
+    "日期": "date",
+    "开盘": "open",
+    "收盘": "close",
+    "最高": "high",
+    "最低": "low",
+    "成交量": "volume",
+    "成交额": "amount",
+    "涨跌幅": "change_percent",
+    "涨跌额": "change_amount",
+    "换手率": "turnover",
+}
+_AKSHARE_NUM_COLS = ["open", "close", "high", "low", "volume", "amount",
+                     "change_percent", "change_amount", "turnover"]
+
+
+@functools.lru_cache(maxsize=1)
+def _pro_api(token: str):
+    """初始化并缓存TuShare pro客户端（同一进程内复用，省去重复初始化）"""
+    import tushare as ts
+    ts.set_token(token)
+    return ts.pro_api()
+
+
+@functools.lru_cache(maxsize=4096)
+def _stock_basic(token: str, ts_code: str):
+    """缓存股票基本信息查询结果
+
+    基本信息以天为单位变化，进程内按ts_code复用是安全的；
+    批量取多只股票时省去重复的HTTP往返。
+    """
+    return _pro_api(token).stock_basic(ts_code=ts_code)
+
+
+def _format_ts_code(stock_code: str) -> str:
+    """把6位股票代码规范成TuShare的ts_code格式（已带交易所后缀则原样返回）"""
+    if "." in stock_code:
+        return stock_code
+    return f"{stock_code[:6]}.{('SH' if stock_code.startswith('6') else 'SZ')}"
+
 
-def fetch_with_tushare(stock_code: str, days: int, token: str) -> Dict[str, Any]:
+def fetch_with_tushare(stock_codes: List[str], days: int, token: str) -> Dict[str, Any]:
     """
-    使用TuShare获取股票历史行情数据
+    使用TuShare批量获取股票历史行情数据
+
+    TuShare的stock_basic和daily接口都接受逗号分隔的ts_code，
+    多只股票只需2次HTTP往返，而不是每只股票2次。
 
     参数:
-        stock_code: 股票代码 (如 000001, 600519)
+        stock_codes: 股票代码列表 (如 ["000001", "600519"])
         days: 获取最近多少天的数据
         token: TuShare API token
 
     返回:
-        股票数据字典
+        股票数据字典（单只为扁平结构，多只含stocks列表）
     """
     try:
-        import tushare as ts
+        import tushare  # noqa: F401  仅做依赖检查，客户端经_pro_api缓存复用
     except ImportError:
         print("错误: 未安装tushare库", file=sys.stderr)
         print("请执行: pip install tushare", file=sys.stderr)
         sys.exit(1)
 
-    # 初始化TuShare
-    ts.set_token(token)
-    pro = ts.pro_api()
+    # 初始化TuShare（进程内缓存，重复调用时复用同一客户端）
+    pro = _pro_api(token)
 
     # 计算日期范围
     end_date = datetime.now()
@@ -44,61 +116,78 @@ def fetch_with_tushare(stock_code: str, days: int, token: str) -> Dict[str, Any]
     start_date_str = start_date.strftime("%Y%m%d")
     end_date_str = end_date.strftime("%Y%m%d")
 
-    print(f"使用TuShare获取股票 {stock_code} 从 {start_date_str} 到 {end_date_str} 的数据...", file=sys.stderr)
+    print(f"使用TuShare获取股票 {','.join(stock_codes)} 从 {start_date_str} 到 {end_date_str} 的数据...", file=sys.stderr)
 
     try:
-        # 获取股票基本信息
-        stock_info = pro.stock_basic(ts_code=stock_code)
+        # 一次请求查询全部股票的基本信息（按ts_code缓存）
+        resolved = [_format_ts_code(code) for code in stock_codes]
+        stock_info = _stock_basic(token, ",".join(resolved))
         if len(stock_info) == 0:
-            # 尝试其他股票代码格式
-            stock_code_formatted = f"{stock_code[:6]}.{('SH' if stock_code.startswith('6') else 'SZ')}"
-            stock_info = pro.stock_basic(ts_code=stock_code_formatted)
-            if len(stock_info) == 0:
-                raise ValueError(f"未找到股票代码 {stock_code} 的信息")
+            raise ValueError(f"未找到股票代码 {','.join(stock_codes)} 的信息")
 
-        stock_name = stock_info.iloc[0]["name"]
-        ts_code = stock_info.iloc[0]["ts_code"]
+        names = dict(zip(stock_info["ts_code"], stock_info["name"]))
+        missing = [c for c in resolved if c not in names]
+        if missing:
+            print(f"警告: 未找到股票代码 {','.join(missing)} 的信息，已跳过", file=sys.stderr)
 
-        # 获取日线行情
+        # 一次请求取回全部股票的日线行情
         df = pro.daily(
-            ts_code=ts_code,
+            ts_code=",".join(c for c in resolved if c in names),
             start_date=start_date_str,
             end_date=end_date_str
         )
 
         if len(df) == 0:
-            raise ValueError(f"未获取到股票 {stock_code} 的行情数据")
-
-        # 转换数据格式
-        data_list = []
-        for idx, row in df.iterrows():
-            data_item = {
-                "date": str(row.get("trade_date", "")),
-                "open": float(row.get("open", 0)),
-                "close": float(row.get("close", 0)),
-                "high": float(row.get("high", 0)),
-                "low": float(row.get("low", 0)),
-                "volume": float(row.get("vol", 0)),
-                "amount": float(row.get("amount", 0)),
-                "change_percent": float(row.get("pct_chg", 0)),
-                "change_amount": 0,  # TuShare不提供涨跌额
-                "turnover": 0  # TuShare日线不直接提供换手率
-            }
-            data_list.append(data_item)
+            raise ValueError(f"未获取到股票 {','.join(stock_codes)} 的行情数据")
+
+        # 转换数据格式：列改名+类型转换在pandas的C层一次完成，
+        # 避免iterrows逐行构造Series
+        df = df.rename(columns=_TUSHARE_RENAME)
+        num_cols = _TUSHARE_NUM_COLS
+        df = df.reindex(columns=["ts_code", "date"] + num_cols)
+        df["date"] = df["date"].fillna("").astype(str)
+        df[num_cols] = df[num_cols].fillna(0.0).astype("float64")
+        df["change_amount"] = 0.0  # TuShare不提供涨跌额
+        df["turnover"] = 0.0  # TuShare日线不直接提供换手率
+
+        # 按ts_code分组，每组一次性转成记录列表
+        grouped = {
+            ts_code: _records(g.drop(columns=["ts_code"]))
+            for ts_code, g in df.groupby("ts_code", sort=False)
+        }
 
-        result = {
-            "stock_code": stock_code,
-            "stock_name": stock_name,
+        # 列表推导替代逐项append，省掉每轮的绑定方法查找和列表扩容
+        stocks = [
+            {
+                "stock_code": code,
+                "stock_name": names.get(ts_code, "未知"),
+                "count": len(data_list := grouped.get(ts_code, [])),
+                "data": data_list,
+            }
+            for code, ts_code in zip(stock_codes, resolved)
+        ]
+        total = sum(s["count"] for s in stocks)
+
+        print(f"成功获取 {total} 条数据", file=sys.stderr)
+
+        # 单只股票保持原有扁平输出结构，批量时输出stocks列表
+        if len(stocks) == 1:
+            result = dict(stocks[0])
+            result.update({
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+                "source": "TuShare"
+            })
+            return result
+
+        return {
             "start_date": start_date_str,
             "end_date": end_date_str,
-            "count": len(data_list),
-            "data": data_list,
+            "count": len(stocks),
+            "stocks": stocks,
             "source": "TuShare"
         }
 
-        print(f"成功获取 {len(data_list)} 条数据", file=sys.stderr)
-        return result
-
     except Exception as e:
         print(f"TuShare获取数据失败: {str(e)}", file=sys.stderr)
         sys.exit(1)
@@ -144,22 +233,15 @@ def fetch_with_akshare(stock_code: str, days: int = 7) -> Dict[str, Any]:
         # 提取股票名称（从第一条记录中）
         stock_name = df.iloc[0]["股票名称"] if len(df) > 0 else "未知"
 
-        # 转换数据格式
-        data_list = []
-        for idx, row in df.iterrows():
-            data_item = {
-                "date": str(row.get("日期", "")),
-                "open": float(row.get("开盘", 0)),
-                "close": float(row.get("收盘", 0)),
-                "high": float(row.get("最高", 0)),
-                "low": float(row.get("最低", 0)),
-                "volume": float(row.get("成交量", 0)),
-                "amount": float(row.get("成交额", 0)),
-                "change_percent": float(row.get("涨跌幅", 0)),
-                "change_amount": float(row.get("涨跌额", 0)),
-                "turnover": float(row.get("换手率", 0))
-            }
-            data_list.append(data_item)
+        # 转换数据格式：中文列名改英文+类型转换在pandas的C层一次完成，
+        # 避免iterrows逐行构造Series
+        df = df.rename(columns=_AKSHARE_RENAME)
+        num_cols = _AKSHARE_NUM_COLS
+        df = df.reindex(columns=["date"] + num_cols)
+        df["date"] = df["date"].fillna("").astype(str)
+        df[num_cols] = df[num_cols].fillna(0.0).astype("float64")
+
+        data_list = _records(df)
 
         result = {
             "stock_code": stock_code,
@@ -179,32 +261,40 @@ def fetch_with_akshare(stock_code: str, days: int = 7) -> Dict[str, Any]:
         sys.exit(1)
 
 
-def fetch_stock_data(stock_code: str, days: int = 7, token: Optional[str] = None, use_akshare: bool = False) -> Dict[str, Any]:
+def fetch_stock_data(stock_codes: List[str], days: int = 7, token: Optional[str] = None, use_akshare: bool = False) -> Dict[str, Any]:
     """
-    获取股票历史行情数据（默认使用TuShare）
+    获取股票历史行情数据（默认使用TuShare，支持批量）
 
     参数:
-        stock_code: 股票代码 (如 000001, 600519)
+        stock_codes: 股票代码列表 (如 ["000001", "600519"])
         days: 获取最近多少天的数据 (默认7天)
         token: TuShare token（默认使用TuShare时必填）
         use_akshare: 是否强制使用AKShare（默认False）
 
     返回:
-        股票数据字典
+        股票数据字典（单只为扁平结构，多只含stocks列表）
     """
+    codes_arg = ",".join(stock_codes)
     if use_akshare:
-        # 使用AKShare
-        return fetch_with_akshare(stock_code, days)
+        # 使用AKShare（接口不支持批量，逐只获取）
+        results = [fetch_with_akshare(code, days) for code in stock_codes]
+        if len(results) == 1:
+            return results[0]
+        return {
+            "count": len(results),
+            "stocks": results,
+            "source": "AKShare"
+        }
     elif token:
-        # 使用TuShare
-        return fetch_with_tushare(stock_code, days, token)
+        # 使用TuShare（批量一次请求）
+        return fetch_with_tushare(stock_codes, days, token)
     else:
         # 未提供token且未指定使用AKShare，报错提示
         print("错误: 需要提供TuShare token或使用 --use_akshare 参数", file=sys.stderr)
         print("\n使用方式1（推荐）：使用TuShare（需要token）", file=sys.stderr)
-        print(f"  python3 {sys.argv[0]} --stock_code {stock_code} --days {days} --token \"your_token_here\"", file=sys.stderr)
+        print(f"  python3 {sys.argv[0]} --stock_code {codes_arg} --days {days} --token \"your_token_here\"", file=sys.stderr)
         print("\n使用方式2：使用AKShare（可选，国内可能无法访问）", file=sys.stderr)
-        print(f"  python3 {sys.argv[0]} --stock_code {stock_code} --days {days} --use_akshare", file=sys.stderr)
+        print(f"  python3 {sys.argv[0]} --stock_code {codes_arg} --days {days} --use_akshare", file=sys.stderr)
         print("\n获取TuShare token: https://tushare.pro/", file=sys.stderr)
         sys.exit(1)
 
@@ -212,7 +302,7 @@ def fetch_stock_data(stock_code: str, days: int = 7, token: Optional[str] = None
 def main():
     parser = argparse.ArgumentParser(description="获取股票历史数据")
     parser.add_argument("--stock_code", type=str, required=True,
-                       help="股票代码 (如: 000001, 600519)")
+                       help="股票代码，多只用逗号分隔 (如: 000001 或 000001,600519)")
     parser.add_argument("--days", type=int, default=7,
                        help="获取最近多少天的数据 (默认: 7)")
     parser.add_argument("--token", type=str, default=None,
@@ -224,16 +314,27 @@ def main():
 
     args = parser.parse_args()
 
-    # 获取股票数据
-    stock_data = fetch_stock_data(args.stock_code, args.days, args.token, args.use_akshare)
+    # 获取股票数据（支持逗号分隔的批量代码）
+    stock_codes = [c.strip() for c in args.stock_code.split(",") if c.strip()]
+    stock_data = fetch_stock_data(stock_codes, args.days, args.token, args.use_akshare)
 
     # 输出结果
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(stock_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(args.output, 'wb') as f:
+                f.write(orjson.dumps(stock_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(stock_data, f, ensure_ascii=False, indent=2)
         print(f"结果已保存到: {args.output}", file=sys.stderr)
     else:
-        print(json.dumps(stock_data, ensure_ascii=False, indent=2))
+        # 直接序列化到stdout，省去先在内存里拼出完整JSON字符串
+        if orjson is not None:
+            sys.stdout.buffer.write(orjson.dumps(stock_data, option=orjson.OPT_INDENT_2))
+            sys.stdout.buffer.write(b"\n")
+        else:
+            json.dump(stock_data, sys.stdout, ensure_ascii=False, indent=2)
+            sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
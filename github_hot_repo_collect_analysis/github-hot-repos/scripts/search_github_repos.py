@@ -6,14 +6,128 @@
 凭证Key: COZE_GITHUB_PAT_7606697694219796480
 """
 
+import asyncio
+import hashlib
 import os
+import re
+import ssl
 import sys
 import argparse
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
-from coze_workload_identity import requests
+from coze_workload_identity import CaBundlePath, HttpsProxy, requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson解析/序列化比stdlib json快数倍，未安装时回退
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    """解析JSON（优先orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj) -> str:
+    """序列化为JSON字符串（优先orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+# aiohttp可选：README扇出在单线程事件循环上并发，比线程池更省内存；
+# 未安装时回退到ThreadPoolExecutor
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Redis响应缓存（可选）：相同查询直接命中缓存，既省延迟也省
+# GitHub每小时5000次的速率配额；redis未安装或连不上时直连API
+try:
+    import redis as redis_lib
+except ImportError:
+    redis_lib = None
+
+# 新鲜期内直接复用缓存：搜索结果1小时，README一天；
+# 过期后带ETag做条件请求，304时续用缓存（304不计入速率配额）
+SEARCH_CACHE_TTL = 3600
+README_CACHE_TTL = 86400
+# 缓存条目在Redis中的保留时长（过了新鲜期仍可用于ETag重验证）
+CACHE_STORE_TTL = 7 * 86400
+
+_redis_client = None
+_redis_unavailable = False
+
+
+def _get_cache():
+    """返回Redis客户端，不可用时返回None（优雅降级为直连API）"""
+    global _redis_client, _redis_unavailable
+    if redis_lib is None or _redis_unavailable:
+        return None
+    if _redis_client is None:
+        try:
+            client = redis_lib.Redis(decode_responses=True)
+            client.ping()
+            _redis_client = client
+        except redis_lib.RedisError:
+            _redis_unavailable = True
+            return None
+    return _redis_client
+
+
+def _cache_get(key: str):
+    """读取缓存的JSON值，未命中或缓存异常时返回None"""
+    cache = _get_cache()
+    if cache is None:
+        return None
+    try:
+        cached = cache.get(key)
+        return _loads(cached) if cached else None
+    except (redis_lib.RedisError, ValueError):
+        return None
+
+
+def _cache_set(key: str, value, ttl: int):
+    """以JSON写入缓存（尽力而为，失败不影响主流程）"""
+    cache = _get_cache()
+    if cache is None:
+        return
+    try:
+        cache.setex(key, ttl, _dumps(value))
+    except redis_lib.RedisError:
+        pass
+
+
+def _cache_entry(key: str) -> Optional[Dict]:
+    """读取带ETag的缓存条目（{"etag","body","fetched_at"}），格式不符视为未命中"""
+    entry = _cache_get(key)
+    if isinstance(entry, dict) and "body" in entry:
+        return entry
+    return None
+
+
+def _cache_store(key: str, etag: Optional[str], body):
+    """写入带ETag的缓存条目，保留到可用于重验证为止"""
+    _cache_set(
+        key,
+        {"etag": etag or "", "body": body, "fetched_at": time.time()},
+        CACHE_STORE_TTL,
+    )
+
+
+def _is_fresh(entry: Dict, ttl: int) -> bool:
+    """缓存条目是否仍在新鲜期内（可免请求直接复用）"""
+    return time.time() - entry.get("fetched_at", 0) < ttl
 
 
 def get_github_token():
@@ -28,8 +142,33 @@ def get_github_token():
     return token
 
 
+def create_session(token: str) -> requests.ConfiguredSession:
+    """
+    创建GitHub API会话
+
+    复用TCP/TLS连接（省去每次请求的握手往返），自动对429/5xx
+    做指数退避重试并尊重Retry-After；认证头只设置一次。
+    """
+    session = requests.session()  # ConfiguredSession，继承代理/CA配置
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "POST"],  # GraphQL查询走POST，同样幂等
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/vnd.github.v3+json",
+    })
+    return session
+
+
 def search_repos(
-    token: str,
+    session: requests.ConfiguredSession,
     query: str,
     start_date: str,
     end_date: str,
@@ -38,9 +177,9 @@ def search_repos(
 ) -> List[Dict]:
     """
     搜索GitHub仓库
-    
+
     Args:
-        token: GitHub Personal Access Token
+        session: 已配置认证和连接池的GitHub API会话
         query: 搜索关键词
         start_date: 起始日期 (YYYY-MM-DD)
         end_date: 结束日期 (YYYY-MM-DD)
@@ -57,21 +196,36 @@ def search_repos(
     else:
         full_query = date_query
     
+    # 先查缓存：新鲜期内直接复用；过期后带ETag做条件请求
+    cache_key = "gh:search:" + hashlib.sha1(
+        f"{full_query}|{sort}|{limit}".encode("utf-8")
+    ).hexdigest()
+    entry = _cache_entry(cache_key)
+    if entry is not None and _is_fresh(entry, SEARCH_CACHE_TTL):
+        print("搜索结果命中缓存", file=sys.stderr)
+        return entry["body"]
+
     url = "https://api.github.com/search/repositories"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
+    # 认证和Accept头已在会话上设置，这里只需按需附加条件请求头
+    headers = {}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
     params = {
         "q": full_query,
         "sort": sort,
         "order": "desc",
         "per_page": min(limit, 100)  # GitHub API最大100条每页
     }
-    
+
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
-        
+        response = session.get(url, headers=headers, params=params, timeout=30)
+
+        if response.status_code == 304:
+            # 内容未变化，续用缓存并刷新新鲜期
+            print("搜索结果未变化（304），复用缓存", file=sys.stderr)
+            _cache_store(cache_key, entry.get("etag"), entry["body"])
+            return entry["body"]
+
         if response.status_code >= 400:
             error_msg = f"GitHub API请求失败: 状态码 {response.status_code}"
             if response.status_code == 403:
@@ -79,39 +233,53 @@ def search_repos(
             error_msg += f", 响应: {response.text}"
             raise Exception(error_msg)
         
-        data = response.json()
+        data = _loads(response.content)
         
         # 检查GitHub API错误
         if "message" in data and "documentation_url" in data:
             raise Exception(f"GitHub API错误: {data['message']}")
-        
-        return data.get("items", [])
+
+        items = data.get("items", [])
+        _cache_store(cache_key, response.headers.get("ETag"), items)
+        return items
         
     except requests.exceptions.RequestException as e:
         raise Exception(f"网络请求失败: {str(e)}")
 
 
-def get_readme(token: str, owner: str, repo: str) -> Optional[str]:
+def get_readme(session: requests.ConfiguredSession, owner: str, repo: str) -> Optional[str]:
     """
     获取仓库的README内容
-    
+
     Args:
-        token: GitHub Personal Access Token
+        session: 已配置认证和连接池的GitHub API会话
         owner: 仓库所有者
         repo: 仓库名称
     
     Returns:
-        README内容（base64解码后的文本），如果不存在则返回None
+        README文本内容，如果不存在则返回None
     """
+    # README内容变化很慢：新鲜期内直接复用缓存，过期后带ETag做条件请求
+    cache_key = f"gh:readme:{owner}/{repo}"
+    entry = _cache_entry(cache_key)
+    if entry is not None and _is_fresh(entry, README_CACHE_TTL):
+        return entry["body"]
+
     url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
+    # raw媒体类型让GitHub直接返回README正文，
+    # 响应比JSON+base64编码小约1/3，也省去本地解码
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
     try:
-        response = requests.get(url, headers=headers, timeout=30)
-        
+        response = session.get(url, headers=headers, timeout=30)
+
+        if response.status_code == 304:
+            # README未变化，续用缓存并刷新新鲜期
+            _cache_store(cache_key, entry.get("etag"), entry["body"])
+            return entry["body"]
+
         if response.status_code == 404:
             return None  # README不存在
         
@@ -119,26 +287,197 @@ def get_readme(token: str, owner: str, repo: str) -> Optional[str]:
             print(f"警告: 获取 {owner}/{repo} README失败: {response.status_code}", file=sys.stderr)
             return None
         
-        data = response.json()
-        
-        # 解码base64内容
-        import base64
-        content = data.get("content", "")
-        if content:
-            try:
-                decoded = base64.b64decode(content)
-                return decoded.decode("utf-8", errors="ignore")
-            except Exception as e:
-                print(f"警告: 解码 {owner}/{repo} README失败: {str(e)}", file=sys.stderr)
-                return None
-        
+        text = response.text
+        if text:
+            _cache_store(cache_key, response.headers.get("ETag"), text)
+            return text
+
         return None
-        
+
     except requests.exceptions.RequestException as e:
         print(f"警告: 获取 {owner}/{repo} README失败: {str(e)}", file=sys.stderr)
         return None
 
 
+# 一条GraphQL查询同时取回仓库列表和README，把1+N次REST往返压成1次
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# README字段按需拼入：不需要README时连取都不取（最便宜的工作是不做的工作）
+_GRAPHQL_README_FIELD = """
+        readme: object(expression: "HEAD:README.md") {
+          ... on Blob { text }
+        }"""
+
+_GRAPHQL_QUERY_TEMPLATE = """
+query($q: String!, $limit: Int!) {
+  search(query: $q, type: REPOSITORY, first: $limit) {
+    nodes {
+      ... on Repository {
+        nameWithOwner
+        description
+        stargazerCount
+        forkCount
+        primaryLanguage { name }
+        url
+        createdAt
+        updatedAt__README_FIELD__
+      }
+    }
+  }
+}
+"""
+
+
+def _graphql_query(include_readme: bool) -> str:
+    """按是否需要README生成GraphQL查询文本"""
+    return _GRAPHQL_QUERY_TEMPLATE.replace(
+        "__README_FIELD__", _GRAPHQL_README_FIELD if include_readme else ""
+    )
+
+
+def fetch_repos_graphql(
+    session: requests.ConfiguredSession,
+    query: str,
+    start_date: str,
+    end_date: str,
+    sort: str = "stars",
+    limit: int = 20,
+    include_readme: bool = True
+) -> List[Dict]:
+    """
+    用GraphQL一次性获取仓库列表及README内容
+
+    参数与search_repos一致，返回格式化后的仓库信息列表。
+    失败时抛出异常，由调用方回退到REST方式。
+    """
+    date_query = f"created:{start_date}..{end_date}"
+    full_query = f"{date_query} {query}".strip() + f" sort:{sort}-desc"
+
+    # GraphQL结果同样走缓存（无ETag，仅按新鲜期复用）
+    cache_key = "gh:gql:" + hashlib.sha1(
+        f"{full_query}|{limit}|{include_readme}".encode("utf-8")
+    ).hexdigest()
+    entry = _cache_entry(cache_key)
+    if entry is not None and _is_fresh(entry, SEARCH_CACHE_TTL):
+        print("GraphQL结果命中缓存", file=sys.stderr)
+        return entry["body"]
+
+    response = session.post(
+        GRAPHQL_URL,
+        json={
+            "query": _graphql_query(include_readme),
+            "variables": {"q": full_query, "limit": min(limit, 100)}
+        },
+        timeout=30
+    )
+
+    if response.status_code >= 400:
+        raise Exception(f"GitHub GraphQL请求失败: 状态码 {response.status_code}")
+
+    data = _loads(response.content)
+    if data.get("errors"):
+        raise Exception(f"GitHub GraphQL错误: {data['errors'][0].get('message')}")
+
+    nodes = data.get("data", {}).get("search", {}).get("nodes") or []
+    results = []
+    for node in nodes:
+        if not node:
+            continue
+        # 局部绑定get，省去每字段一次的绑定方法查找
+        get = node.get
+        language = get("primaryLanguage") or {}
+        readme = get("readme") or {}
+        results.append({
+            "name": get("nameWithOwner"),
+            "description": get("description") or "",
+            "stars": get("stargazerCount", 0),
+            "forks": get("forkCount", 0),
+            "language": language.get("name") or "Unknown",
+            "url": get("url"),
+            "created_at": get("createdAt"),
+            "updated_at": get("updatedAt"),
+            "readme": readme.get("text") or ""
+        })
+
+    _cache_store(cache_key, None, results)
+    return results
+
+
+async def _get_readme_async(session, sem, proxy: str, owner: str, repo: str) -> Optional[str]:
+    """异步获取单个仓库的README（与get_readme共用缓存和ETag逻辑）"""
+    cache_key = f"gh:readme:{owner}/{repo}"
+    entry = _cache_entry(cache_key)
+    if entry is not None and _is_fresh(entry, README_CACHE_TTL):
+        return entry["body"]
+
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    if entry is not None and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    async with sem:
+        try:
+            url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+            async with session.get(url, headers=headers, proxy=proxy) as resp:
+                if resp.status == 304:
+                    _cache_store(cache_key, entry.get("etag"), entry["body"])
+                    return entry["body"]
+                if resp.status == 404:
+                    return None
+                if resp.status >= 400:
+                    print(f"警告: 获取 {owner}/{repo} README失败: {resp.status}", file=sys.stderr)
+                    return None
+                text = await resp.text()
+                if text:
+                    _cache_store(cache_key, resp.headers.get("ETag"), text)
+                    return text
+                return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # 超时与网络错误一样按单仓库降级为None，不中断整个扇出
+            print(f"警告: 获取 {owner}/{repo} README失败: {str(e)}", file=sys.stderr)
+            return None
+
+
+def fetch_readmes_async(token: str, repo_names: List[tuple]) -> List[Optional[str]]:
+    """
+    在一个事件循环上并发获取全部README
+
+    单线程处理整个扇出，信号量限制同时8个在途请求；
+    返回顺序与repo_names一致。与ConfiguredSession一致地
+    走COZE出口代理和自定义CA，不读取标准代理环境变量。
+    """
+    # 与ConfiguredSession相同的出口配置：代理缺失时在这里抛错，
+    # 与同步路径的行为一致
+    proxy = HttpsProxy()
+    ca_path = CaBundlePath()
+    ssl_ctx = ssl.create_default_context(cafile=ca_path) if ca_path else None
+
+    async def _run():
+        sem = asyncio.Semaphore(8)
+        timeout = aiohttp.ClientTimeout(total=30)
+        connector = aiohttp.TCPConnector(ssl=ssl_ctx) if ssl_ctx is not None else None
+        async with aiohttp.ClientSession(
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=timeout,
+            connector=connector,
+            trust_env=False,
+        ) as session:
+            tasks = [
+                _get_readme_async(session, sem, proxy, owner, repo)
+                for owner, repo in repo_names
+            ]
+            return await asyncio.gather(*tasks)
+
+    return asyncio.run(_run())
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """按UTF-8字节数截断文本（不会切断多字节字符）"""
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
 def format_repo_info(repo: Dict, readme: Optional[str]) -> Dict:
     """
     格式化仓库信息
@@ -150,23 +489,34 @@ def format_repo_info(repo: Dict, readme: Optional[str]) -> Dict:
     Returns:
         格式化后的仓库信息
     """
+    # 局部绑定get，9个字段只做一次绑定方法查找
+    get = repo.get
     return {
-        "name": repo.get("full_name"),
-        "description": repo.get("description") or "",
-        "stars": repo.get("stargazers_count", 0),
-        "forks": repo.get("forks_count", 0),
-        "language": repo.get("language") or "Unknown",
-        "url": repo.get("html_url"),
-        "created_at": repo.get("created_at"),
-        "updated_at": repo.get("updated_at"),
+        "name": get("full_name"),
+        "description": get("description") or "",
+        "stars": get("stargazers_count", 0),
+        "forks": get("forks_count", 0),
+        "language": get("language") or "Unknown",
+        "url": get("html_url"),
+        "created_at": get("created_at"),
+        "updated_at": get("updated_at"),
         "readme": readme or ""
     }
 
 
+# 相对日期一次正则匹配+查表分派，替代逐个子串扫描，也便于扩展新单位
+_REL_DATE_RE = re.compile(r"^(\d+)\s+(day|week|month)s?\s+ago$")
+_REL_DATE_UNITS = {
+    "day": lambda n: timedelta(days=n),
+    "week": lambda n: timedelta(weeks=n),
+    "month": lambda n: timedelta(days=30 * n),
+}
+
+
 def parse_date(date_str: str) -> str:
     """
     解析日期字符串为YYYY-MM-DD格式
-    
+
     支持格式：
     - YYYY-MM-DD
     - N days ago (如 "7 days ago")
@@ -175,26 +525,18 @@ def parse_date(date_str: str) -> str:
     """
     # 尝试解析相对日期
     date_str = date_str.lower().strip()
-    
-    if "days ago" in date_str or "day ago" in date_str:
-        days = int(date_str.split()[0])
-        date = datetime.now() - timedelta(days=days)
-        return date.strftime("%Y-%m-%d")
-    elif "weeks ago" in date_str or "week ago" in date_str:
-        weeks = int(date_str.split()[0])
-        date = datetime.now() - timedelta(weeks=weeks)
-        return date.strftime("%Y-%m-%d")
-    elif "months ago" in date_str or "month ago" in date_str:
-        months = int(date_str.split()[0])
-        date = datetime.now() - timedelta(days=months * 30)
-        return date.strftime("%Y-%m-%d")
-    else:
-        # 尝试解析为YYYY-MM-DD格式
-        try:
-            datetime.strptime(date_str, "%Y-%m-%d")
-            return date_str
-        except ValueError:
-            raise ValueError(f"不支持的日期格式: {date_str}")
+
+    m = _REL_DATE_RE.match(date_str)
+    if m:
+        delta = _REL_DATE_UNITS[m.group(2)](int(m.group(1)))
+        return (datetime.now() - delta).strftime("%Y-%m-%d")
+
+    # 尝试解析为YYYY-MM-DD格式
+    try:
+        datetime.strptime(date_str, "%Y-%m-%d")
+        return date_str
+    except ValueError:
+        raise ValueError(f"不支持的日期格式: {date_str}")
 
 
 def main():
@@ -228,7 +570,18 @@ def main():
         default=20,
         help="返回结果数量（默认：20，最大100）"
     )
-    
+    parser.add_argument(
+        "--no-readme",
+        action="store_true",
+        help="不获取README内容（只需要仓库概要时省去全部README请求）"
+    )
+    parser.add_argument(
+        "--readme-max-bytes",
+        type=int,
+        default=0,
+        help="README内容截断字节数，0表示不截断（README往往占输出大头）"
+    )
+
     args = parser.parse_args()
     
     # 解析日期
@@ -245,6 +598,9 @@ def main():
     except ValueError as e:
         print(f"错误: {str(e)}", file=sys.stderr)
         sys.exit(1)
+
+    # 所有GitHub请求共用一个会话：复用连接、统一重试和认证头
+    session = create_session(token)
     
     # 搜索仓库
     print(f"正在搜索GitHub仓库...", file=sys.stderr)
@@ -253,37 +609,74 @@ def main():
     print(f"  排序方式: {args.sort}", file=sys.stderr)
     print(f"  结果数量: {args.limit}", file=sys.stderr)
     
+    # 优先走GraphQL：一次请求同时取回仓库列表和README；
+    # 失败时回退到REST搜索+并行README的方式
+    results = None
     try:
-        repos = search_repos(
-            token=token,
+        results = fetch_repos_graphql(
+            session=session,
             query=args.query,
             start_date=start_date,
             end_date=end_date,
             sort=args.sort,
-            limit=args.limit
+            limit=args.limit,
+            include_readme=not args.no_readme
         )
     except Exception as e:
-        print(f"错误: {str(e)}", file=sys.stderr)
-        sys.exit(1)
-    
-    if not repos:
+        print(f"GraphQL查询失败，回退到REST API: {str(e)}", file=sys.stderr)
+
+    if results is None:
+        try:
+            repos = search_repos(
+                session=session,
+                query=args.query,
+                start_date=start_date,
+                end_date=end_date,
+                sort=args.sort,
+                limit=args.limit
+            )
+        except Exception as e:
+            print(f"错误: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+
+        if not repos:
+            print("未找到匹配的仓库", file=sys.stderr)
+            print(json.dumps({"repos": []}, ensure_ascii=False, indent=2))
+            sys.exit(0)
+
+        print(f"找到 {len(repos)} 个仓库，正在获取README内容...", file=sys.stderr)
+
+        # 并发获取每个仓库的README：优先aiohttp单线程事件循环，
+        # 未安装时用线程池（逐个串行时每次都要等一个网络往返）
+        if args.no_readme:
+            readmes = [None] * len(repos)
+        elif aiohttp is not None:
+            repo_names = [tuple(repo["full_name"].split("/", 1)) for repo in repos]
+            readmes = fetch_readmes_async(token, repo_names)
+        else:
+            def fetch_one(repo: Dict) -> Optional[str]:
+                owner, repo_name = repo["full_name"].split("/", 1)
+                print(f"  获取 {owner}/{repo_name} README...", file=sys.stderr)
+                return get_readme(session, owner, repo_name)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                readmes = list(executor.map(fetch_one, repos))
+
+        # 格式化仓库信息（顺序与搜索结果一致）
+        results = [format_repo_info(repo, readme) for repo, readme in zip(repos, readmes)]
+
+    if not results:
         print("未找到匹配的仓库", file=sys.stderr)
         print(json.dumps({"repos": []}, ensure_ascii=False, indent=2))
         sys.exit(0)
-    
-    print(f"找到 {len(repos)} 个仓库，正在获取README内容...", file=sys.stderr)
-    
-    # 获取每个仓库的README
-    results = []
-    for i, repo in enumerate(repos):
-        owner, repo_name = repo["full_name"].split("/")
-        print(f"  [{i+1}/{len(repos)}] 获取 {owner}/{repo_name} README...", file=sys.stderr)
-        
-        readme = get_readme(token, owner, repo_name)
-        
-        # 格式化仓库信息
-        repo_info = format_repo_info(repo, readme)
-        results.append(repo_info)
+
+    # 按需截断README，README常常占输出体积的大头
+    if args.readme_max_bytes > 0:
+        for item in results:
+            if item.get("readme"):
+                item["readme"] = _truncate_utf8(item["readme"], args.readme_max_bytes)
+
+    print(f"共获取 {len(results)} 个仓库", file=sys.stderr)
     
     # 输出JSON结果
     output = {
@@ -297,7 +690,13 @@ def main():
         }
     }
     
-    print(json.dumps(output, ensure_ascii=False, indent=2))
+    # 直接序列化到stdout，省去先在内存里拼出完整JSON字符串
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+    else:
+        json.dump(output, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":